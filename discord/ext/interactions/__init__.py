@@ -6,4 +6,5 @@ from .models import (
     ApplicationCommandInteractionDataOption,
     ApplicationCommandInteractionData,
     ApplicationCommandOptionType,
+    Interaction,
 )
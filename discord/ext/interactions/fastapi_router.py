@@ -3,59 +3,209 @@ This section of the module has a function that returns an APIRouter for starlett
 
 It has no use outside of that.
 """
-from json import loads
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from importlib.util import find_spec
+from typing import List, Optional, Tuple
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
 
 try:
     from fastapi import APIRouter, Request, FastAPI
-    from fastapi.responses import JSONResponse
+    from fastapi.responses import Response
 except ImportError:
     fastapi = None
     raise ImportError("FastAPI must be installed to be able to install the router.")
 
-try:
-    from nacl import VerifyKey
-except ImportError:
-    raise ImportError("PyNaCl must be installed to be able to install the router.")
+if find_spec("nacl") is None and find_spec("cryptography") is None:
+    raise ImportError(
+        "PyNaCl or cryptography must be installed to be able to install the router."
+    )
+
+from .models import Interaction, _verify_key
 
 __ROUTER__ = APIRouter()
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# These bodies never change, so they're serialized once instead of on every request.
+_EMPTY = b"{}"
+_PONG = b'{"type":1}'
+
+
+def _signed_message(headers, body: bytes) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Reads the signature headers of a request.
+
+    :return: (message, signature) as bytes, or None if the headers are missing or malformed.
+    """
+    signature = headers.get("X-Signature-Ed25519")
+    timestamp = headers.get("X-Signature-Timestamp")
+    if not timestamp or not signature or len(signature) != 128:
+        return None
+    try:
+        signature = bytes.fromhex(signature)
+    except ValueError:
+        return None
+    return b"".join((timestamp.encode(), body)), signature
+
+
+class BatchVerifier:
+    """
+    Buffers signature checks and verifies them in batches from a single background task.
+
+    Requests that are already queued when a batch starts are verified together, rather than each one
+    waking up the verifier on its own.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_batch: int = 64,
+        window: float = 0,
+        executor: Executor = None,
+    ):
+        """
+        :param max_batch: The maximum amount of signatures to verify in one batch.
+        :param window: How long (in seconds) to wait for more signatures before verifying a batch.
+            Defaults to 0 (dispatch as soon as the queue is drained). Since signatures are still checked one at
+            a time, waiting only adds latency.
+        :param executor: The executor batches are verified in. Defaults to a shared thread pool.
+        """
+        self.max_batch = max_batch
+        self.window = window
+        self.executor = executor or _VERIFY_POOL
+        self._queue = None
+        self._task = None
+
+    async def verify(self, key: str, message: bytes, signature: bytes) -> bool:
+        """
+        Queues a signature to be verified, and waits for the result.
+
+        :param key: The hex-encoded public key
+        :param message: The signed message (timestamp + body)
+        :param signature: The raw signature bytes
+        :return: Whether the signature is valid.
+        """
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((key, message, signature, future))
+        return await future
+
+    async def close(self):
+        """Stops the background task. Any signatures still waiting to be verified are cancelled."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()], asyncio.CancelledError())
+            self._queue = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                if self.window:
+                    await asyncio.sleep(self.window)
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                # Both libsodium and OpenSSL are called without the GIL held, so batches can be checked
+                # in parallel without blocking the event loop.
+                verified = loop.run_in_executor(
+                    self.executor, self._verify_batch, [item[:3] for item in batch]
+                )
+            except asyncio.CancelledError as e:
+                self._fail(batch, e)
+                raise
+            except Exception as e:
+                # e.g. the executor has been shut down. Fail this batch rather than leaving it hanging,
+                # and keep serving the next one.
+                self._fail(batch, e)
+                continue
+            verified.add_done_callback(partial(self._resolve, batch))
+
+    @staticmethod
+    def _fail(batch, exc: BaseException):
+        for *_, future in batch:
+            if future.done():
+                continue
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+
+    @staticmethod
+    def _resolve(batch, verified: asyncio.Future):
+        if verified.cancelled():
+            results = [False] * len(batch)
+        elif verified.exception() is not None:
+            BatchVerifier._fail(batch, verified.exception())
+            return
+        else:
+            results = verified.result()
+        for (*_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _verify_batch(items: List[Tuple[str, bytes, bytes]]) -> List[bool]:
+        # Neither PyNaCl nor cryptography expose a batch verification API, so each signature is checked
+        # individually. This also means a bad signature never invalidates the rest of the batch.
+        return [
+            _verify_key(key)(message, signature) for key, message, signature in items
+        ]
 
 
 class Router:
-    def __init__(self, bot, public_key):
+    def __init__(self, bot, public_key, *, verifier: BatchVerifier = None):
         self.bot = bot
         self.public_key = public_key
+        self.verifier = verifier or BatchVerifier()
         self._route_added = False
 
     @staticmethod
     def verify_key(headers, body: bytes, *, key):
-        signature = headers.get("X-Signature-Ed25519")
-        timestamp = headers.get("X-Signature-Timestamp")
-
-        message = timestamp.encode() + body
-        body = body.decode("utf-8", "replace")
-        try:
-            vk = VerifyKey(bytes.fromhex(key))
-            vk.verify(message, bytes.fromhex(signature))
-            return True
-        except Exception as e:
-            pass
-        return False
-
-    def route(self, request: Request):
+        signed = _signed_message(headers, body)
+        if signed is None:
+            return False
+        return _verify_key(key)(*signed)
+
+    async def close(self):
+        """Stops the router's signature verifier. This is called automatically when the app shuts down."""
+        await self.verifier.close()
+
+    async def route(self, request: Request):
         body = await request.body()
-        if not self.verify_key(request.headers, body, key=self.public_key):
-            return JSONResponse({}, 401)
+        signed = _signed_message(request.headers, body)
+        if signed is None or not await self.verifier.verify(self.public_key, *signed):
+            return Response(_EMPTY, 401, media_type="application/json")
         json = loads(body)
         if json["type"] == 1:
-            return JSONResponse({"type": 1})
-        from .models import Interaction
+            return Response(_PONG, media_type="application/json")
 
-        # noinspection PyUnresolvedReferences,PyTypeChecker
-        BOT.dispatch("ext_interaction", Interaction.from_request(BOT, json))
-        return JSONResponse({}, 202)
+        self.bot.dispatch(
+            "ext_interaction", await Interaction.from_request(self.bot, json)
+        )
+        return Response(_EMPTY, 202, media_type="application/json")
 
     def mount(self, app: FastAPI, *, prefix: str = "", path: str = "/"):
         if not self._route_added:
             self._route_added = True
             __ROUTER__.add_route(path, self.route, methods=["POST"])
         app.include_router(__ROUTER__, prefix=prefix)
+        # FastAPI.add_event_handler was removed in newer releases, but the router still has it.
+        app.router.add_event_handler("shutdown", self.close)
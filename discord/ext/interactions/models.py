@@ -1,25 +1,85 @@
+import asyncio
 import logging
-import textwrap
+import time
 from enum import IntEnum
-from typing import Any, List, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, List, Optional, Union
 from datetime import datetime
 
 import discord
 from discord.ext import commands
 
 from .errors import InteractionsError, ExpiredToken
-from aiohttp import ClientSession
+from aiohttp import ClientSession, TCPConnector
 from discord import HTTPException
 from inspect import Parameter as Param
 
 BASE = "https://discord.com/api/v8"
 USERAGENT = "DiscordBot (https://github.com/dragdev-studios/interactions-python, 0.0.1)"
 
+try:
+    from orjson import dumps, loads
 
-def to_json(d: dict):
-    from json import dumps
+    def to_json(d: dict) -> bytes:
+        return dumps(d)
 
-    return dumps(d, ensure_ascii=True)
+except ImportError:
+    from json import dumps, loads
+
+    def to_json(d: dict) -> bytes:
+        return dumps(d, ensure_ascii=True).encode()
+
+
+def _cap(s: str, n: int) -> str:
+    """Truncates s to at most n characters, ending it with an ellipsis if anything was cut off."""
+    return s if len(s) <= n else s[: n - 1] + "\u2026"
+
+
+@lru_cache(maxsize=16)
+def _verify_key(public_key: str):
+    """
+    Returns a (cached) function that checks a signature against the hex-encoded public key.
+
+    The returned function takes (message, signature) as bytes, and returns whether the signature is valid.
+    PyNaCl is used if it's installed (it verifies roughly twice as fast), falling back to cryptography.
+    """
+    key = bytes.fromhex(public_key)
+    try:
+        from nacl.signing import VerifyKey
+        from nacl.exceptions import BadSignatureError
+    except ImportError:
+        pass
+    else:
+        vk = VerifyKey(key)
+
+        def verify(message: bytes, signature: bytes) -> bool:
+            try:
+                vk.verify(message, signature)
+            except (BadSignatureError, ValueError):
+                return False
+            return True
+
+        return verify
+
+    try:
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+    except ImportError as e:
+        raise ImportError(
+            "You must install PyNaCl or cryptography before using this function."
+        ) from e
+
+    pk = Ed25519PublicKey.from_public_bytes(key)
+
+    def verify(message: bytes, signature: bytes) -> bool:
+        try:
+            pk.verify(signature, message)
+        except InvalidSignature:
+            return False
+        return True
+
+    return verify
 
 
 class InteractionType(IntEnum):
@@ -43,15 +103,28 @@ class InteractionResponseFlags(IntEnum):
 class ApplicationCommandInteractionDataOption:
     """https://discord.com/developers/docs/interactions/slash-commands#interaction-applicationcommandinteractiondataoption"""
 
+    __slots__ = ("name", "value", "options")
+
     def __init__(self, name: str, value: Any, options):
         self.name = name
         self.value = value
         self.options: List[ApplicationCommandInteractionDataOption] = options
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Creates an option (and any nested options) from the option JSON in an interaction."""
+        return cls(
+            name=data["name"],
+            value=data.get("value"),
+            options=[cls.from_dict(option) for option in data.get("options", [])],
+        )
+
 
 class ApplicationCommandInteractionData:
     """https://discord.com/developers/docs/interactions/slash-commands#interaction-applicationcommandinteractiondata"""
 
+    __slots__ = ("id", "name", "options")
+
     def __init__(
         self, id: str, name: str, options: ApplicationCommandInteractionDataOption
     ):
@@ -59,6 +132,18 @@ class ApplicationCommandInteractionData:
         self.name = name
         self.options = options
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Creates the data from the "data" JSON in an interaction."""
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            options=[
+                ApplicationCommandInteractionDataOption.from_dict(option)
+                for option in data.get("options", [])
+            ],
+        )
+
 
 class ApplicationCommandOptionType(IntEnum):
     SUB_COMMAND = 1
@@ -72,6 +157,27 @@ class ApplicationCommandOptionType(IntEnum):
 
 
 class Interaction:
+    __slots__ = (
+        "bot",
+        "id",
+        "type",
+        "data",
+        "guild",
+        "channel",
+        "member",
+        "token",
+        "token_start",
+        "_token_start_mono",
+        "version",
+        "__raw",
+        "_followup_uri",
+        "_auth_headers",
+        "_json_headers",
+    )
+
+    _session: ClassVar[Optional[ClientSession]] = None
+    _session_loop: ClassVar[Optional[asyncio.AbstractEventLoop]] = None
+
     def __init__(
         self,
         bot,
@@ -97,10 +203,106 @@ class Interaction:
         # These aren't really useful but we'll include them anyway.
         self.token = token
         self.token_start = datetime.utcnow()
+        self._token_start_mono = time.monotonic()
         self.version = version
 
         # private
         self.__raw = raw
+        self._followup_uri = "{}/webhooks/{}/{}/messages/@original".format(
+            BASE, self.bot.user.id, self.token
+        )
+        self._auth_headers = {"Authorization": "Bot " + self.bot.http.token}
+        self._json_headers = {
+            **self._auth_headers,
+            "Content-Type": "application/json",
+        }
+
+    def _check_token_alive(self):
+        """Raises if the interaction token is missing, or has expired (15 minutes after the interaction)."""
+        if time.monotonic() - self._token_start_mono > 900:
+            raise ExpiredToken
+        if not self.token:
+            raise InteractionsError("No interaction token provided.")
+
+    @classmethod
+    def _get_session(cls) -> ClientSession:
+        """
+        Returns the ClientSession shared by all interactions.
+
+        A new session is created if there isn't one, it was closed, or it belongs to a different event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._session_loop is not loop:
+            cls._discard_session()
+            cls._session = ClientSession(
+                connector=TCPConnector(limit_per_host=32, ttl_dns_cache=300),
+                headers={"User-Agent": USERAGENT},
+            )
+            cls._session_loop = loop
+        return cls._session
+
+    @classmethod
+    def _has_session(cls) -> bool:
+        """Whether there's an open shared session that can be used from the running loop."""
+        return (
+            cls._session is not None
+            and not cls._session.closed
+            and cls._session_loop is asyncio.get_running_loop()
+        )
+
+    @classmethod
+    def _discard_session(cls):
+        """Forgets a session that can't be used from the running loop, closing it on its own loop if possible."""
+        session, loop = cls._session, cls._session_loop
+        cls._session = None
+        cls._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # Its loop has stopped, so there's nothing left that can close it.
+            logging.warning(
+                "Discarding an unclosed interactions ClientSession from a stopped event loop. "
+                "Await Interaction.close_session() before closing the loop to avoid this."
+            )
+
+    @classmethod
+    async def close_session(cls):
+        """
+        Closes the shared ClientSession.
+
+        Await this when shutting down (e.g. before closing your bot or event loop), otherwise aiohttp will
+        warn about an unclosed session.
+        """
+        if cls._has_session():
+            session = cls._session
+            cls._session = None
+            cls._session_loop = None
+            await session.close()
+        else:
+            cls._discard_session()
+
+    async def _request(self, method: str, **kwargs):
+        """Makes a request to the @original message of this interaction, returning the decoded JSON (if any)."""
+        response = await self._get_session().request(
+            method, self._followup_uri, **kwargs
+        )
+        try:
+            body = await response.read()
+            if response.status not in range(200, 300):
+                # Errors aren't always JSON (e.g. an HTML page from Cloudflare on a 5xx or 429).
+                try:
+                    message = loads(body)
+                except ValueError:
+                    message = body.decode(errors="replace")
+                raise HTTPException(response, message)
+            res = loads(body) if body else None
+        finally:
+            # Hand the connection back to the pool straight away, rather than when the response
+            # gets garbage collected.
+            response.release()
+        return res
 
     @classmethod
     async def from_request(
@@ -114,14 +316,19 @@ class Interaction:
         :return: The resolved Interaction
         """
         guild = bot.get_guild(int(body["guild_id"]))
+        # Discord sends the full member object with the interaction, so there's no need to fetch it.
+        member_data = body["member"]
+        member = guild.get_member(int(member_data["user"]["id"])) or discord.Member(
+            data=member_data, guild=guild, state=bot._connection
+        )
 
         kwargs = dict(
             id=body["id"],
             type=body["type"],
+            data=ApplicationCommandInteractionData.from_dict(body["data"]),
             guild=guild,
             channel=bot.get_channel(int(body["channel_id"])),
-            member=guild.get_member(body["member"]["id"])
-            or await guild.fetch_member(body["member"]["id"]),
+            member=member,
             token=body["token"],
             version=body["version"],
             raw=body,
@@ -196,13 +403,7 @@ class Interaction:
 
         https://discord.com/developers/docs/interactions/slash-commands#followup-messages
         (PATCH /webhooks/<application_id>/<interaction_token>/messages/@original to edit your initial response to an Interaction)"""
-        URI = BASE + "/webhooks/{}/{}/messages/@original".format(
-            str(self.bot.user.id), self.token
-        )
-        if (datetime.utcnow() - self.token_start).total_seconds() > 900:
-            raise ExpiredToken
-        if not self.token:
-            raise InteractionsError("No interaction token provided.")
+        self._check_token_alive()
 
         data = self.followup(
             content,
@@ -212,45 +413,18 @@ class Interaction:
             allowed_mentions=allowed_mentions,
         )
 
-        async with ClientSession() as session:
-            async with session.patch(
-                URI,
-                data=to_json(data),
-                headers={
-                    "Authorization": "Bot " + self.bot.http.token,
-                    "User-Agent": USERAGENT,
-                },
-            ) as response:
-                if response.status != 200:
-                    raise HTTPException(response, await response.json())
-                res = await response.json()
-        return res
+        return await self._request(
+            "PATCH", data=to_json(data), headers=self._json_headers
+        )
 
     async def delete_initial_response(self, *, delay: float = None):
         """Deletes your initial response message.
 
         https://discord.com/developers/docs/interactions/slash-commands#followup-messages
         (DELETE /webhooks/<application_id>/<interaction_token>/messages/@original to delete your initial response to an Interaction)"""
-        URI = BASE + "/webhooks/{}/{}/messages/@original".format(
-            str(self.bot.user.id), self.token
-        )
-        if (datetime.utcnow() - self.token_start).total_seconds() > 900:
-            raise ExpiredToken
-        if not self.token:
-            raise InteractionsError("No interaction token provided.")
+        self._check_token_alive()
 
-        async with ClientSession() as session:
-            async with session.delete(
-                URI,
-                headers={
-                    "Authorization": "Bot " + self.bot.http.token,
-                    "User-Agent": USERAGENT,
-                },
-            ) as response:
-                if response.status != 200:
-                    raise HTTPException(response, await response.json())
-                res = await response.json()
-        return res
+        return await self._request("DELETE", headers=self._auth_headers)
 
     async def create_new_initial_response(self, *args, **kwargs):
         """Creates a new follow up message"""
@@ -269,97 +443,139 @@ class Interaction:
         raw_body is the request body
         public_key is your application's public key.
         """
+        verify = _verify_key(public_key)
+
+        if len(X_Signature_Ed25519) != 128:
+            return False
         try:
-            from nacl.signing import VerifyKey
-            from nacl.exceptions import BadSignatureError
-        except ImportError as e:
-            raise ImportError(
-                "You must install PyNaCl before using this function."
-            ) from e
-
-        key = VerifyKey(bytes.fromhex(public_key))
-        try:
-            key.verify(
-                str(X_Signature_Timestamp + raw_body).encode(),
-                bytes.fromhex(X_Signature_Ed25519),
-            )
-        except BadSignatureError:
+            signature = bytes.fromhex(X_Signature_Ed25519)
+        except ValueError:
             return False
-        else:
-            return True
+        return verify(str(X_Signature_Timestamp + raw_body).encode(), signature)
 
 
 class SlashCommand:
-    BASE_TYPES = {
-        str: ApplicationCommandOptionType.STRING,
-        int: ApplicationCommandOptionType.INTEGER,
-        bool: ApplicationCommandOptionType.BOOLEAN,
-        discord.User: ApplicationCommandOptionType.USER,
-        discord.TextChannel: ApplicationCommandOptionType.CHANNEL,
-        discord.Role: ApplicationCommandOptionType.ROLE,
-        commands.UserConverter: ApplicationCommandOptionType.USER,
-        commands.TextChannelConverter: ApplicationCommandOptionType.CHANNEL,
-        commands.RoleConverter: ApplicationCommandOptionType.ROLE,
-    }
+    BASE_TYPES = MappingProxyType(
+        {
+            str: ApplicationCommandOptionType.STRING,
+            int: ApplicationCommandOptionType.INTEGER,
+            bool: ApplicationCommandOptionType.BOOLEAN,
+            discord.User: ApplicationCommandOptionType.USER,
+            discord.TextChannel: ApplicationCommandOptionType.CHANNEL,
+            discord.Role: ApplicationCommandOptionType.ROLE,
+            commands.UserConverter: ApplicationCommandOptionType.USER,
+            commands.TextChannelConverter: ApplicationCommandOptionType.CHANNEL,
+            commands.RoleConverter: ApplicationCommandOptionType.ROLE,
+        }
+    )
 
     @staticmethod
-    def _resolve_options(command):
-        command = command
-        content = {
+    def _describe(command, _type=ApplicationCommandOptionType.SUB_COMMAND):
+        return {
             "name": command.name,
-            "description": textwrap.shorten(command.short_doc, 100),
-            "type": 1 if isinstance(command, commands.Command) else 2,
+            "description": _cap(command.short_doc, 100),
+            "type": _type,
             "options": [],
         }
-        if isinstance(command, commands.Group):
-            _options = []
-            for cmd in command.walk_commands():
-                _options.append(SlashCommand._resolve_options(cmd))
-            content["options"] += _options
-        else:
-            args: Union[str, Param] = command.clean_params.values()
-            _options = []
-            for argument in args:
-                if isinstance(argument, str):
-                    raise TypeError(
-                        "Got unexpected string in argument list: " + argument
-                    )
-                _type = SlashCommand.BASE_TYPES.get(
-                    argument, ApplicationCommandOptionType.STRING
+
+    @staticmethod
+    def _resolve_leaf(command, _type=ApplicationCommandOptionType.SUB_COMMAND):
+        content = SlashCommand._describe(command, _type)
+        args: Union[str, Param] = command.clean_params.values()
+        _options = content["options"]
+        _get = SlashCommand.BASE_TYPES.get
+        for argument in args:
+            if isinstance(argument, str):
+                raise TypeError("Got unexpected string in argument list: " + argument)
+            _type = _get(argument.annotation, ApplicationCommandOptionType.STRING)
+            required = argument.default == Param.empty
+            # default = None if required else Param.default
+            e = {
+                # Option names must match ^[\w-]{1,32}$, so they can't end with an ellipsis.
+                "name": argument.name[:32],
+                "description": "[No Description]",
+                "type": _type,
+                "required": required,
+            }
+            # if default:
+            #     e["default"] = default
+            _options.append(e)
+        return content
+
+    @staticmethod
+    def _resolve_options(command):
+        if not isinstance(command, commands.Group):
+            return SlashCommand._resolve_leaf(command)
+
+        # Discord only supports two levels of nesting (command -> group -> subcommand), so there's
+        # no need to recurse any deeper than this.
+        content = SlashCommand._describe(command)
+        _options = content["options"]
+        for cmd in command.commands:
+            if isinstance(cmd, commands.Group):
+                group = SlashCommand._describe(
+                    cmd, ApplicationCommandOptionType.SUB_COMMAND_GROUP
                 )
-                required = argument.default == Param.empty
-                # default = None if required else Param.default
-                e = {
-                    "name": textwrap.shorten(argument.name, 32),
-                    "description": "[No Description]",
-                    "type": _type,
-                    "required": required,
-                }
-                # if default:
-                #     e["default"] = default
-                _options.append(e)
-            content["options"] += _options
+                group["options"] = [
+                    SlashCommand._resolve_leaf(sub) for sub in cmd.commands
+                ]
+                _options.append(group)
+            else:
+                _options.append(SlashCommand._resolve_leaf(cmd))
         return content
 
     @staticmethod
-    async def create_global_commands(client_id: int, token, *_commands):
-        async with ClientSession() as session:
-            for command in _commands:
-                payload = command
-                uri = payload.pop("uri", "/applications/{client_id}/commands").format(
-                    client_id=str(client_id), guild_id=str(payload.pop("guild_id", ""))
+    async def _post_command(session, semaphore, client_id: int, token, command):
+        payload = dict(command)
+        uri = payload.pop("uri", "/applications/{client_id}/commands").format(
+            client_id=str(client_id), guild_id=str(payload.pop("guild_id", ""))
+        )
+        async with semaphore:
+            async with session.post(
+                BASE + uri,
+                data=to_json(payload),
+                headers={
+                    "Authorization": "Bot " + token,
+                    "Content-Type": "application/json",
+                },
+            ) as response:
+                if response.status not in range(200, 300):
+                    raise HTTPException(response, await response.json())
+
+    @staticmethod
+    async def _post_commands(session, client_id: int, token, _commands, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks = [
+            asyncio.ensure_future(
+                SlashCommand._post_command(
+                    session, semaphore, client_id, token, command
                 )
-                async with session.post(
-                    BASE + "/applications/{}/commands".format(str(client_id)),
-                    data=to_json(payload),
-                    headers={
-                        "Authorization": "Bot " + token,
-                        "User-Agent": USERAGENT,
-                        "Content-Type": "application/json",
-                    },
-                ) as response:
-                    if response.status not in range(200, 300):
-                        raise HTTPException(response, await response.json())
+            )
+            for command in _commands
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Don't leave the other posts running (and their errors unretrieved) once one has failed.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @staticmethod
+    async def create_global_commands(
+        client_id: int, token, *_commands, concurrency: int = 5
+    ):
+        # Only borrow the shared session if it's already open; otherwise this would leave it open
+        # with nothing around to close it (e.g. when publishing from a one-off asyncio.run()).
+        if Interaction._has_session():
+            return await SlashCommand._post_commands(
+                Interaction._get_session(), client_id, token, _commands, concurrency
+            )
+        async with ClientSession(headers={"User-Agent": USERAGENT}) as session:
+            await SlashCommand._post_commands(
+                session, client_id, token, _commands, concurrency
+            )
 
     @staticmethod
     def _validate_schema(s):
@@ -415,6 +631,7 @@ class SlashCommandContainer:
         self.bot = bot
         self.excluded = exclude or []
         self._publish = []
+        self._publish_ids = set()
 
     def add_command(
         self,
@@ -430,7 +647,10 @@ class SlashCommandContainer:
         :param guild: If this command is guild-only, this is the guild to assign it to.
         :param auto_generate_schema: Whether to automatically generate the schema (payload data). If False, you must provide it in kwargs.
         """
-        if obj in self._publish:
+        if obj in self.excluded:
+            return
+        key = (id(obj), guild.id if guild else None)
+        if key in self._publish_ids:
             raise IndexError(
                 'Command "{}" is already registered as a slash command.'.format(
                     repr(obj)
@@ -446,6 +666,7 @@ class SlashCommandContainer:
             schema["guild_id"] = guild.id
             schema["uri"] = "/applications/{client_id}/guilds/{guild_id}/commands"
         self._publish.append(schema)
+        self._publish_ids.add(key)
 
     async def publish_command(self, it: List[dict] = None):
         """